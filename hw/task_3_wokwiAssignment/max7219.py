@@ -35,6 +35,13 @@ class Matrix8x8:
         self.cs.init(cs.OUT, True)
         self.buffer = bytearray(8 * num)
         self.num = num
+        # Copy of the buffer as last pushed to the chain, so show() can
+        # skip rows that did not change since the previous refresh
+        self._last_shown = bytearray(8 * num)
+        self._resync = True
+        # Scratch buffer for one row's register/data chain, allocated
+        # once here so show() never allocates in steady state
+        self._row_buf = bytearray(2 * num)
         fb = framebuf.FrameBuffer(self.buffer, 8 * num, 8, self.orientation)
         self.framebuf = fb
         # Provide methods for accessing FrameBuffer graphics primitives. This is a workround
@@ -68,6 +75,9 @@ class Matrix8x8:
             (_SHUTDOWN, 1),
         ):
             self._write(command, data)
+        # Row registers are in an unknown state after a re-init, so the
+        # next show() must push every row regardless of _last_shown
+        self._resync = True
 
     def brightness(self, value):
         if not 0 <= value <= 15:
@@ -75,11 +85,37 @@ class Matrix8x8:
         self._write(_INTENSITY, value)
 
     def show(self):
+        # One spi.write of the whole register/data chain per row instead
+        # of a 2-byte transaction per cascaded module: the bytes shift
+        # through the chain identically, but without the Python call and
+        # setup overhead between every module
+        # Rows whose bytes match what is already latched in the chain
+        # are skipped entirely, so a frame where e.g. only a bullet
+        # moved clocks out one or two rows instead of all eight
+        num = self.num
+        buffer = self.buffer
+        last = self._last_shown
+        resync = self._resync
+        row = self._row_buf
         for y in range(8):
+            base = y * num
+            if not resync:
+                changed = False
+                for m in range(num):
+                    if buffer[base + m] != last[base + m]:
+                        changed = True
+                        break
+                if not changed:
+                    continue
+            for m in range(num):
+                b = buffer[base + m]
+                row[2 * m] = _DIGIT0 + y
+                row[2 * m + 1] = b
+                last[base + m] = b
             self.cs(0)
-            for m in range(self.num):
-                self.spi.write(bytearray([_DIGIT0 + y, self.buffer[(y * self.num) + m]]))
+            self.spi.write(row)
             self.cs(1)
+        self._resync = False
 
     def text_scroll(self, text, delay=0.1):
 
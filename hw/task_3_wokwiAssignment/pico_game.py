@@ -1,8 +1,25 @@
+from array import array
 from machine import Pin, ADC, SPI
-from utime import sleep, ticks_ms, ticks_diff
+from utime import sleep_ms, ticks_ms, ticks_diff
 from max7219 import Matrix8x8
+import micropython
+from micropython import const
 import urandom
 
+# Gameplay logging: USB-CDC print() can block for milliseconds when the
+# host isn't reading, so in-game prints are compiled out via const()
+DEBUG = const(0)
+
+# Button indices (shared by read_buttons order and the IRQ event table)
+BTN_LEFT, BTN_DOWN, BTN_RIGHT, BTN_UP = 0, 1, 2, 3
+
+# Display geometry for the 4-module chain. const() values are inlined
+# by the compiler, so hot-path reads become immediate operands instead
+# of self.display_* attribute lookups (the attributes stay around for
+# anything configured at init time).
+_DW = const(32)
+_DH = const(8)
+
 class GameSystem:
     def __init__(self,
                  num_displays=4,
@@ -31,68 +48,133 @@ class GameSystem:
         self.pot_left = ADC(Pin(pot_pin_left))
         self.pot_right = ADC(Pin(pot_pin_right))
 
+        # Cache bound methods once: LOAD_ATTR on self.display.pixel etc.
+        # is one of the most expensive bytecodes in MicroPython and these
+        # get called hundreds of times per frame
+        self._pixel = self.display.pixel
+        self._fill = self.display.fill
+        self._show = self.display.show
+        self._read_bl = self.button_left.value
+        self._read_bd = self.button_down.value
+        self._read_br = self.button_right.value
+        self._read_bu = self.button_up.value
+        self._read_pl = self.pot_left.read_u16
+        self._read_pr = self.pot_right.read_u16
+
+        # Edge-triggered button events: the falling-edge IRQ does the
+        # debounce once per physical press, so frames with no button
+        # activity spend zero time on input and presses that land
+        # between two frames are never missed
+        self.button_debounce = 150
+        self._btn_events = bytearray(4)
+        self._btn_irq_last = [0, 0, 0, 0]
+        buttons = (self.button_left, self.button_down,
+                   self.button_right, self.button_up)
+        for i, pin in enumerate(buttons):
+            pin.irq(trigger=Pin.IRQ_FALLING,
+                    handler=lambda p, i=i: self._on_button(i))
+
         # Timing
         self.last_update = ticks_ms()
         self.frame_delay = 80  # Aim for ~12.5 FPS
         self.running = True
 
     def clear(self):
-        self.display.fill(0)
+        self._fill(0)
 
     def draw_pixel(self, x, y, val=1):
-        if 0 <= x < self.display_width and 0 <= y < self.display_height:
-            self.display.pixel(x, y, val)
+        if 0 <= x < _DW and 0 <= y < _DH:
+            self._pixel(x, y, val)
 
     def show(self):
-        self.display.show()
+        self._show()
 
     def read_buttons(self):
-        return {
-            "left":  not self.button_left.value(),
-            "down":  not self.button_down.value(),
-            "right": not self.button_right.value(),
-            "up":    not self.button_up.value()
-        }
+        # Tuple instead of dict: no per-frame allocation or hashing,
+        # callers unpack as left, down, right, up
+        return (not self._read_bl(), not self._read_bd(),
+                not self._read_br(), not self._read_bu())
 
     def read_pots(self):
-        return {
-            "left": self.pot_left.read_u16(),
-            "right": self.pot_right.read_u16()
-        }
+        # (left, right) raw u16 readings
+        return (self._read_pl(), self._read_pr())
+
+    def _on_button(self, index):
+        # IRQ context: keep it tiny, no allocation
+        now = ticks_ms()
+        if ticks_diff(now, self._btn_irq_last[index]) > self.button_debounce:
+            self._btn_irq_last[index] = now
+            self._btn_events[index] = 1
+
+    def button_event(self, index):
+        # Consume a debounced press captured by the IRQ handler
+        if self._btn_events[index]:
+            self._btn_events[index] = 0
+            return True
+        return False
+
+    def clear_button_events(self):
+        # Drop presses latched for buttons the current screen never
+        # consumed; call on every state transition so e.g. a RIGHT
+        # pressed on the game-over screen can't start a game the
+        # instant the menu appears
+        self._btn_events[:] = b"\x00\x00\x00\x00"
 
     def update(self):
         pass
 
     def run(self):
+        # Rebind the timing functions as locals: LOAD_FAST instead of a
+        # LOAD_GLOBAL dict lookup on every frame of the loop
+        _tms = ticks_ms
+        _td = ticks_diff
         while self.running:
-            now = ticks_ms()
-            if ticks_diff(now, self.last_update) >= self.frame_delay:
-                self.last_update = now
-                self.update()
-            sleep(0.01)
+            self.last_update = _tms()
+            self.update()
+            # Sleep off most of the remaining frame budget, then spin the
+            # last millisecond so every frame starts right on its
+            # deadline instead of drifting by up to 10 ms per loop
+            remaining = self.frame_delay - _td(_tms(), self.last_update)
+            if remaining > 2:
+                sleep_ms(remaining - 1)
+            while _td(_tms(), self.last_update) < self.frame_delay:
+                pass
 
 
 class GunGame(GameSystem):
+    # 3x5 pixel font for digits 0-9, each digit packed into a single
+    # 15-bit int (3 bits per row, top row in the highest bits). Built
+    # once at class creation instead of a dict-of-lists per instance.
+    FONT_PACKED = (
+        0b111_101_101_101_111, # 0
+        0b010_110_010_010_111, # 1
+        0b111_001_111_100_111, # 2
+        0b111_001_011_001_111, # 3
+        0b101_101_111_001_001, # 4
+        0b111_100_111_001_111, # 5
+        0b111_100_111_101_111, # 6
+        0b111_001_001_001_001, # 7
+        0b111_101_111_101_111, # 8
+        0b111_101_111_001_111, # 9
+    )
+    FONT_ERR = 0b111_100_110_100_111 # 'E' for out-of-range values
+
+    # Menu order; the selection is shown on the display as a digit 1-4
+    DIFFICULTY_LEVELS = ("easy", "medium", "hard", "nightmare")
+
     def __init__(self):
-        # 3x5 Pixel Font (bitmaps for digits 0-9)
-        self.TINY_FONT = {
-            0: [7, 5, 5, 5, 7], # 0b111, 0b101, 0b101, 0b101, 0b111
-            1: [2, 6, 2, 2, 7], # 0b010, 0b110, 0b010, 0b010, 0b111
-            2: [7, 1, 7, 4, 7], # 0b111, 0b001, 0b111, 0b100, 0b111
-            3: [7, 1, 3, 1, 7], # 0b111, 0b001, 0b011, 0b001, 0b111
-            4: [5, 5, 7, 1, 1], # 0b101, 0b101, 0b111, 0b001, 0b001
-            5: [7, 4, 7, 1, 7], # 0b111, 0b100, 0b111, 0b001, 0b111
-            6: [7, 4, 7, 5, 7], # 0b111, 0b100, 0b111, 0b101, 0b111
-            7: [7, 1, 1, 1, 1], # 0b111, 0b001, 0b001, 0b001, 0b001
-            8: [7, 5, 7, 5, 7], # 0b111, 0b101, 0b111, 0b101, 0b111
-            9: [7, 5, 7, 1, 7], # 0b111, 0b101, 0b111, 0b001, 0b111
-        }
         super().__init__()
-        self.initialize_game()
-
-    def initialize_game(self):
         print("Welcome to GunGame!")
-        
+        print("Menu: UP/DOWN picks difficulty 1-4, RIGHT starts.")
+
+        # State machine: MENU -> GAME -> GAME_OVER -> MENU. Everything is
+        # driven from the buttons so the run loop never blocks on
+        # input() over USB serial
+        self.game_state = "MENU"
+        self.menu_selection = 0
+        self.button_debounce = 200 # Longer debounce while in menus
+
+    def initialize_game(self, choice):
         difficulty_settings = {
             "easy":   {"mags": 8, "cap": 8, "height": 2, "h_delay": 500, "v_delay": 700, "spawn_delay": 10000, "total_targets": 10, "reload_time": 250, "slow_budget": 10000},
             "medium": {"mags": 5, "cap": 6, "height": 3, "h_delay": 350, "v_delay": 500, "spawn_delay": 8000, "total_targets": 8, "reload_time": 500, "slow_budget": 7000},
@@ -100,27 +182,17 @@ class GunGame(GameSystem):
             "nightmare": {"mags": 1, "cap": 3, "height": 5, "h_delay": 80, "v_delay": 120, "spawn_delay": 99999, "total_targets": 1, "reload_time": 1000, "slow_budget": 1000},
         }
 
-        # Select difficulty
-        while True:
-            try:
-                choice = input("Enter difficulty (easy, medium, hard, nightmare): ").lower()
-                if choice in difficulty_settings:
-                    settings = difficulty_settings[choice]
-                    self.magazines_total = settings["mags"]
-                    self.mag_capacity = settings["cap"]
-                    self.target_height = settings["height"]
-                    self.target_move_delay_h = settings["h_delay"]
-                    self.target_move_delay_v = settings["v_delay"]
-                    self.target_spawn_delay = settings["spawn_delay"]
-                    self.total_targets_to_spawn = settings["total_targets"]
-                    self.reload_duration = settings["reload_time"]
-                    self.slowdown_budget_max = settings["slow_budget"] # Added
-                    print(f"Difficulty set to: {choice.upper()}")
-                    break
-                else:
-                    print("Invalid input, try again.")
-            except:
-                print("Invalid input, try again.")
+        settings = difficulty_settings[choice]
+        self.magazines_total = settings["mags"]
+        self.mag_capacity = settings["cap"]
+        self.target_height = settings["height"]
+        self.target_move_delay_h = settings["h_delay"]
+        self.target_move_delay_v = settings["v_delay"]
+        self.target_spawn_delay = settings["spawn_delay"]
+        self.total_targets_to_spawn = settings["total_targets"]
+        self.reload_duration = settings["reload_time"]
+        self.slowdown_budget_max = settings["slow_budget"] # Added
+        print(f"Difficulty set to: {choice.upper()}")
 
         print("Game started!")
 
@@ -131,60 +203,83 @@ class GunGame(GameSystem):
         # Ammo
         self.bullets_in_mag = self.mag_capacity
         self.magazines_left = self.magazines_total - 1
-        self.bullets = []
+
+        # Preallocated pools laid out as parallel arrays (one array per
+        # field instead of a list of dicts): slot i of each array is one
+        # bullet/target, so field access is an int array index instead of
+        # a string-hashed dict probe, and nothing allocates during play
+        n_bullets = self.mag_capacity * self.magazines_total
+        n_targets = self.total_targets_to_spawn
+        self.bullet_x = array('b', (0,) * n_bullets)
+        self.bullet_y = array('b', (0,) * n_bullets)
+        self.bullet_active = bytearray(n_bullets)
+        self.tgt_x = array('b', (0,) * n_targets)
+        self.tgt_top = array('b', (0,) * n_targets)
+        self.tgt_height = array('b', (0,) * n_targets)
+        self.tgt_dir = array('b', (0,) * n_targets)
+        self.tgt_hits_mask = bytearray(n_targets)
+        self.tgt_kill_hits = bytearray(n_targets)
+        self.tgt_last_h = array('l', (0,) * n_targets)
+        self.tgt_last_v = array('l', (0,) * n_targets)
+        self.tgt_active = bytearray(n_targets)
 
         # Target Management
-        self.targets = []
+        self.targets_alive = 0
         self.targets_spawned_count = 0
         self.targets_destroyed_count = 0
         self._last_target_spawn = ticks_ms()
         self.spawn_new_target() 
 
-        # Button timing / debouncing
-        self.button_last_time = {"left":0,"right":0,"up":0,"down":0}
+        # Faster debounce for gameplay (menus use 200 ms)
         self.button_debounce = 150
 
         # Reloading State
         self.is_reloading = False
         self.reload_start_time = 0
 
-        # Slowdown State
+        # Slowdown State (Q8.8 fixed point: 256 = 1.0x, 768 = 3.0x).
+        # The RP2040 has no FPU, so keeping this integer-only avoids
+        # soft-float division every frame
         self.slowdown_budget = self.slowdown_budget_max
-        self.slowdown_recharge_rate = 0.5 # 50% recharge rate
-        self.slowdown_warning_threshold = self.slowdown_budget_max * 0.25
-        self.slowdown_factor = 1.0 # Current slowdown (1.0 = normal)
+        self.slowdown_recharge_q8 = 128 # 0.5 recharge rate in Q8.8
+        self.slowdown_warning_threshold = self.slowdown_budget_max // 4
+        self.slowdown_q8 = 256 # Current slowdown (256 = normal speed)
 
         # Game running flag
         self.game_over = False
         self.win = False 
         self.lose_message = ""
 
+        # Render gating: update() only runs _render on frames where
+        # something visible changed (see the dirty checks there)
+        self._frame_dirty = True
+        self._last_blink_phase = 0
+        self._was_running_low = False
+
     # === Drawing ===
+    # The shift/mask inner loops below are pure integer work, so the
+    # native emitter skips the bytecode interpreter for them entirely
+    @micropython.native
     def draw_number(self, number, x_offset, y_offset):
-        if number < 0 or number > 9:
-            bitmap = [7, 4, 6, 4, 7] # 'E'
+        if 0 <= number <= 9:
+            packed = self.FONT_PACKED[number]
         else:
-            bitmap = self.TINY_FONT[number]
-        
-        for y, row in enumerate(bitmap):
+            packed = self.FONT_ERR
+
+        draw = self.draw_pixel
+        for y in range(5):
+            row = (packed >> ((4 - y) * 3)) & 7
             for x in range(3): # Font is 3 pixels wide
                 if (row >> (2 - x)) & 1:
-                    self.draw_pixel(x_offset + x, y_offset + y, 1)
+                    draw(x_offset + x, y_offset + y, 1)
 
     def draw_ammo_numerical(self):
-        # Clear first 8x8 matrix
-        for x in range(8):
-            for y in range(8):
-                self.draw_pixel(x, y, 0)
-        
+        # No need to clear the first 8x8 matrix pixel-by-pixel here:
+        # update() already wiped the whole framebuffer with clear()
         self.draw_number(self.magazines_left, 0, 2)
         self.draw_number(self.bullets_in_mag, 4, 2)
-            
+
     def draw_reloading_numerical(self):
-        for x in range(8):
-            for y in range(8):
-                self.draw_pixel(x, y, 0)
-                
         now = ticks_ms()
         elapsed = ticks_diff(now, self.reload_start_time)
         
@@ -192,251 +287,329 @@ class GunGame(GameSystem):
             self.draw_number(self.magazines_left, 0, 2)
             self.draw_number(0, 4, 2)
 
+    @micropython.native
     def draw_targets(self):
-        for t in self.targets:
-            for seg_index in range(t['height']):
-                y = t['top'] + seg_index
-                if 0 <= y < self.display_height:
-                    alive = not t['hits'][seg_index]
-                    self.draw_pixel(t['x'], y, 1 if alive else 0)
+        draw = self.draw_pixel
+        height = _DH
+        active = self.tgt_active
+        for i in range(len(active)):
+            if not active[i]:
+                continue
+            mask = self.tgt_hits_mask[i]
+            x = self.tgt_x[i]
+            top = self.tgt_top[i]
+            for seg_index in range(self.tgt_height[i]):
+                y = top + seg_index
+                if 0 <= y < height:
+                    alive = not (mask & (1 << seg_index))
+                    draw(x, y, 1 if alive else 0)
 
     # === Spawning / Bullets ===
     def spawn_new_target(self):
         if self.targets_spawned_count >= self.total_targets_to_spawn:
             return 
         
-        spawn_y = urandom.randint(0, self.display_height - self.target_height)
-        
-        new_target = {
-            "x": self.display_width,
-            "top": spawn_y,
-            "height": self.target_height,
-            "hits": [False] * self.target_height,
-            "dir": 1,
-            "_last_move_h": ticks_ms(),
-            "_last_move_v": ticks_ms(),
-            "destroyed": False
-        }
-        self.targets.append(new_target)
+        spawn_y = urandom.randint(0, _DH - self.target_height)
+
+        # Reuse a free slot from the pool instead of allocating
+        active = self.tgt_active
+        slot = -1
+        for i in range(len(active)):
+            if not active[i]:
+                slot = i
+                break
+        if slot < 0:
+            return
+
+        now = ticks_ms()
+        self.tgt_x[slot] = _DW
+        self.tgt_top[slot] = spawn_y
+        self.tgt_height[slot] = self.target_height
+        self.tgt_hits_mask[slot] = 0  # bit i set = segment i has been hit
+        self.tgt_kill_hits[slot] = (self.target_height + 1) // 2
+        self.tgt_dir[slot] = 1
+        self.tgt_last_h[slot] = now
+        self.tgt_last_v[slot] = now
+        active[slot] = 1
+        self.targets_alive += 1
+        self._frame_dirty = True
         self.targets_spawned_count += 1
         self._last_target_spawn = ticks_ms()
-        print(f"New target spawned! ({self.targets_spawned_count}/{self.total_targets_to_spawn})")
+        if DEBUG:
+            print(f"New target spawned! ({self.targets_spawned_count}/{self.total_targets_to_spawn})")
 
     def spawn_bullet(self, x, y):
-        self.bullets.append({"x": x, "y": y})
+        # Grab a free pool slot; the pool covers every bullet the player
+        # can ever fire, so a full pool just means nothing to do
+        active = self.bullet_active
+        for i in range(len(active)):
+            if not active[i]:
+                self.bullet_x[i] = x
+                self.bullet_y[i] = y
+                active[i] = 1
+                self._frame_dirty = True
+                return
 
     def update_bullets(self):
-        new_bullets = []
-        for b in self.bullets:
-            b['x'] += 1
+        # Index live targets by x once per frame so each bullet does a
+        # single hash lookup instead of scanning every target
+        by_x = {}
+        tgt_active = self.tgt_active
+        tgt_x = self.tgt_x
+        for i in range(len(tgt_active)):
+            if tgt_active[i]:
+                by_x.setdefault(tgt_x[i], []).append(i)
+
+        bullet_active = self.bullet_active
+        bullet_x = self.bullet_x
+        bullet_y = self.bullet_y
+        width = _DW
+        for i in range(len(bullet_active)):
+            if not bullet_active[i]:
+                continue
+            bx = bullet_x[i] + 1
+            bullet_x[i] = bx
+            self._frame_dirty = True
             hit_a_target = False
-            
-            for t in self.targets:
-                if b['x'] == t['x']:
-                    rel = b['y'] - t['top']
-                    if 0 <= rel < t['height'] and not t['hits'][rel]:
-                        t['hits'][rel] = True
-                        print(f"Bullet hit target at segment {rel}!")
-                        hit_a_target = True 
-                        
-                        num_hits = sum(t['hits'])
-                        if num_hits >= (t['height'] / 2):
-                            t['destroyed'] = True
+
+            candidates = by_x.get(bx)
+            if candidates:
+                for ti in candidates:
+                    rel = bullet_y[i] - self.tgt_top[ti]
+                    mask = self.tgt_hits_mask[ti]
+                    if 0 <= rel < self.tgt_height[ti] and not (mask & (1 << rel)):
+                        mask |= 1 << rel
+                        self.tgt_hits_mask[ti] = mask
+                        if DEBUG:
+                            print(f"Bullet hit target at segment {rel}!")
+                        hit_a_target = True
+
+                        # popcount: heights are <= 5, so bin() is cheap
+                        num_hits = bin(mask).count('1')
+                        if num_hits >= self.tgt_kill_hits[ti]:
+                            tgt_active[ti] = 0
+                            self.targets_alive -= 1
                             self.targets_destroyed_count += 1
-                            print("Target destroyed!")
-                        
-                        break 
-            
-            if hit_a_target:
-                continue 
-            
-            if b['x'] < self.display_width:
-                new_bullets.append(b)
-        
-        self.bullets = new_bullets
-        self.targets = [t for t in self.targets if not t['destroyed']]
+                            if DEBUG:
+                                print("Target destroyed!")
+
+                        break
+
+            if hit_a_target or bx >= width:
+                bullet_active[i] = 0
 
 
     # === Target movement (MODIFIED) ===
-    def update_targets(self, current_slowdown_factor):
+    def update_targets(self, slowdown_q8):
+        _td = ticks_diff
         now = ticks_ms()
-        # Calculate effective delays
-        effective_h_delay = self.target_move_delay_h * current_slowdown_factor
-        effective_v_delay = self.target_move_delay_v * current_slowdown_factor
-
-        for t in self.targets:
-            if ticks_diff(now, t['_last_move_h']) >= effective_h_delay:
-                t['_last_move_h'] = now
-                t['x'] -= 1
-                
-                if t['x'] < 8:
+        # Calculate effective delays (Q8.8 multiply, then drop fraction)
+        effective_h_delay = (self.target_move_delay_h * slowdown_q8) >> 8
+        effective_v_delay = (self.target_move_delay_v * slowdown_q8) >> 8
+
+        active = self.tgt_active
+        tgt_x = self.tgt_x
+        tgt_top = self.tgt_top
+        tgt_height = self.tgt_height
+        for i in range(len(active)):
+            if not active[i]:
+                continue
+            if _td(now, self.tgt_last_h[i]) >= effective_h_delay:
+                self.tgt_last_h[i] = now
+                tx = tgt_x[i] - 1
+                tgt_x[i] = tx
+                self._frame_dirty = True
+
+                if tx < 8:
                     self.game_over = True
                     self.win = False
                     self.lose_message = "☠️ Target breached your defense!"
                     return
 
-                player_collides_y = t['top'] <= self.player_y < (t['top'] + t['height'])
-                if t['x'] == self.player_x and player_collides_y:
+                top = tgt_top[i]
+                player_collides_y = top <= self.player_y < (top + tgt_height[i])
+                if tx == self.player_x and player_collides_y:
                     self.game_over = True
                     self.win = False
                     self.lose_message = "☠️ Direct hit on player!"
                     return
 
-            if ticks_diff(now, t['_last_move_v']) >= effective_v_delay:
-                t['_last_move_v'] = now
-                next_top = t['top'] + t['dir']
-                if next_top < 0 or next_top + t['height'] > self.display_height:
-                    t['dir'] *= -1
-                    next_top = t['top'] + t['dir']
-                t['top'] = next_top
+            if _td(now, self.tgt_last_v[i]) >= effective_v_delay:
+                self.tgt_last_v[i] = now
+                next_top = tgt_top[i] + self.tgt_dir[i]
+                if next_top < 0 or next_top + tgt_height[i] > _DH:
+                    self.tgt_dir[i] = -self.tgt_dir[i]
+                    next_top = tgt_top[i] + self.tgt_dir[i]
+                tgt_top[i] = next_top
+                self._frame_dirty = True
 
     # === Reloading (MODIFIED) ===
-    def update_reload_status(self, current_slowdown_factor):
+    def update_reload_status(self, slowdown_q8):
         if not self.is_reloading:
             return
-        
-        effective_reload_duration = self.reload_duration * current_slowdown_factor
-        
+
+        effective_reload_duration = (self.reload_duration * slowdown_q8) >> 8
+
         now = ticks_ms()
         if ticks_diff(now, self.reload_start_time) >= effective_reload_duration:
             self.is_reloading = False
             self.bullets_in_mag = self.mag_capacity
-            print("Reload complete!")
+            self._frame_dirty = True
+            if DEBUG:
+                print("Reload complete!")
+
+    # === Menu / game-over screens (button driven, never block) ===
+    def update_menu(self):
+        if self.button_event(BTN_UP):
+            self.menu_selection = (self.menu_selection - 1) % len(self.DIFFICULTY_LEVELS)
+        if self.button_event(BTN_DOWN):
+            self.menu_selection = (self.menu_selection + 1) % len(self.DIFFICULTY_LEVELS)
+        if self.button_event(BTN_RIGHT):
+            self.initialize_game(self.DIFFICULTY_LEVELS[self.menu_selection])
+            self.game_state = "GAME"
+            self.clear_button_events()
+            return
 
-    # === Pot & buttons ===
-    def button_pressed(self, name, state):
-        now = ticks_ms()
-        if not state:
-            return False
-        if ticks_diff(now, self.button_last_time[name]) > self.button_debounce:
-            self.button_last_time[name] = now
-            return True
-        return False
+        self.clear()
+        self.draw_number(self.menu_selection + 1, 0, 2)
+        self.show()
 
-    # === Main update ===
-    def update(self):
-        now = ticks_ms()
-        
-        # --- Check Game Over Conditions ---
+    def update_game_over(self):
+        if self.button_event(BTN_UP):
+            self.game_state = "MENU"
+            self.button_debounce = 200
+            self.clear_button_events()
+        elif self.button_event(BTN_DOWN):
+            print("Game over. Thanks for playing!")
+            self.running = False
+
+    # === Per-frame steps ===
+    # update() used to be one ~100-line method; split into small helpers
+    # each step keeps a narrow local table (cheaper call frames) and the
+    # numeric ones can be compiled with @micropython.native
+    def _check_end_conditions(self):
+        # True means the frame is done (state changed or game ended)
         if self.game_over:
             self.clear()
             self.show()
-            
+
             if self.win:
                 print("🎯 All targets destroyed! You win!")
             else:
-                print(self.lose_message) 
+                print(self.lose_message)
 
             print("------------------------------------")
-            
-            while True:
-                try:
-                    again = input("Play again? (y/n): ").lower()
-                    if again == "y":
-                        self.initialize_game()
-                        return
-                    elif again == "n":
-                        print("Game over. Thanks for playing!")
-                        self.running = False
-                        return
-                    else:
-                        print("Invalid input. Please enter 'y' or 'n'.")
-                except:
-                    print("Invalid input. Please enter 'y' or 'n'.")
-        
-        # --- Check Win Condition ---
+            print("UP = play again, DOWN = quit")
+            self.game_state = "GAME_OVER"
+            self.button_debounce = 200
+            self.clear_button_events()
+            return True
+
+        # Win: every target destroyed
         if self.targets_destroyed_count == self.total_targets_to_spawn:
             self.game_over = True
             self.win = True
-            return
+            return True
 
-        # --- Check Lose Condition (Out of Ammo) ---
+        # Lose: out of ammo with targets still alive
         no_bullets = self.bullets_in_mag == 0
         no_mags = self.magazines_left == 0
-        targets_remain = len(self.targets) > 0
-        
+        targets_remain = self.targets_alive > 0
+
         if no_bullets and no_mags and targets_remain and not self.is_reloading:
             self.game_over = True
             self.win = False
             self.lose_message = "☠️ Out of ammo! Target remains."
-            return
-        
-        # --- Handle Spawning ---
+            return True
+        return False
+
+    @micropython.native
+    def _handle_spawning(self, now):
         time_to_spawn = ticks_diff(now, self._last_target_spawn) >= self.target_spawn_delay
-        screen_is_clear = len(self.targets) == 0
+        screen_is_clear = self.targets_alive == 0
         more_targets_to_spawn = self.targets_spawned_count < self.total_targets_to_spawn
-        
+
         if more_targets_to_spawn and (time_to_spawn or screen_is_clear):
             self.spawn_new_target()
 
-        # --- Handle Inputs ---
-        self.clear()
-        buttons = self.read_buttons()
-        pots_raw = self.read_pots()
-
-        # Left pot (Player Y)
-        raw_y = pots_raw['left']
-        self.player_y = int((raw_y / 65535) * (self.display_height - 1))
-
+    @micropython.native
+    def _handle_slowdown(self, pot_val):
         # --- Right pot (Slowdown) ---
-        pot_val = pots_raw['right']
-        # Map 0-65535 to a 3.0x - 1.0x factor
-        # (65535 -> 1.0x, 0 -> 3.0x)
-        desired_factor = 1.0 + ((65535 - pot_val) / 65535) * 2.0
-        
-        if self.slowdown_budget <= 0 and desired_factor > 1.0:
-            self.slowdown_factor = 1.0 # Force normal speed, out of budget
+        # Map 0-65535 to a 3.0x - 1.0x factor in Q8.8
+        # (65535 -> 256 = 1.0x, 0 -> 768 = 3.0x)
+        desired_q8 = 256 + (((65535 - pot_val) * 512) >> 16)
+
+        if self.slowdown_budget <= 0 and desired_q8 > 256:
+            self.slowdown_q8 = 256 # Force normal speed, out of budget
             self.slowdown_budget = 0
         else:
-            self.slowdown_factor = desired_factor
-        
-        # Update budget
-        if self.slowdown_factor > 1.0:
+            self.slowdown_q8 = desired_q8
+
+        # Update budget (all integer math)
+        if self.slowdown_q8 > 256:
             # Drain budget proportional to slowdown amount
-            drain = self.frame_delay * (self.slowdown_factor - 1.0)
+            drain = (self.frame_delay * (self.slowdown_q8 - 256)) >> 8
             self.slowdown_budget = max(0, self.slowdown_budget - drain)
         else:
             # Recharge budget
-            recharge = self.frame_delay * self.slowdown_recharge_rate
+            recharge = (self.frame_delay * self.slowdown_recharge_q8) >> 8
             self.slowdown_budget = min(self.slowdown_budget_max, self.slowdown_budget + recharge)
-        # --- End Slowdown Logic ---
+
+    def _handle_inputs(self):
+        raw_y, pot_val = self.read_pots()
+
+        # Left pot (Player Y): multiply + shift instead of /65535.
+        # Scaling by _DH (not _DH-1) keeps row 7 reachable at full
+        # deflection: 65535 * 8 >> 16 == 7
+        new_y = (raw_y * _DH) >> 16
+        if new_y != self.player_y:
+            self.player_y = new_y
+            self._frame_dirty = True
+
+        self._handle_slowdown(pot_val)
 
         # Player X movement
-        if self.button_pressed("left", buttons['left']):
-            self.player_x = max(8, self.player_x - 1) 
-        elif self.button_pressed("right", buttons['right']):
+        if self.button_event(BTN_LEFT):
+            self.player_x = max(8, self.player_x - 1)
+            self._frame_dirty = True
+        elif self.button_event(BTN_RIGHT):
             self.player_x = min(15, self.player_x + 1)
+            self._frame_dirty = True
 
         # Up: reload
-        if self.button_pressed("up", buttons['up']):
+        if self.button_event(BTN_UP):
             if self.is_reloading:
-                print("Already reloading!")
+                if DEBUG:
+                    print("Already reloading!")
             elif self.magazines_left > 0:
                 self.is_reloading = True
                 self.reload_start_time = ticks_ms()
                 self.magazines_left -= 1
                 self.bullets_in_mag = 0 
-                print("Up button pressed! Reloading...")
+                if DEBUG:
+                    print("Up button pressed! Reloading...")
             else:
-                print("Up button pressed! No spare magazines.")
+                if DEBUG:
+                    print("Up button pressed! No spare magazines.")
 
         # Down: shoot
-        if self.button_pressed("down", buttons['down']):
+        if self.button_event(BTN_DOWN):
             if self.is_reloading:
-                print("Reloading! Can't shoot.")
+                if DEBUG:
+                    print("Reloading! Can't shoot.")
             elif self.bullets_in_mag > 0:
                 self.spawn_bullet(self.player_x, self.player_y)
                 self.bullets_in_mag -= 1
-                print("Down button pressed! Bullet shot.")
+                if DEBUG:
+                    print("Down button pressed! Bullet shot.")
             else:
-                print("Down button pressed! No bullets left.")
+                if DEBUG:
+                    print("Down button pressed! No bullets left.")
 
-        # --- Update Game State ---
-        self.update_targets(self.slowdown_factor) 
-        self.update_bullets()
-        self.update_reload_status(self.slowdown_factor) 
+    @micropython.native
+    def _render(self, now):
+        self.clear()
 
-        # --- Draw Everything ---
         if self.is_reloading:
             self.draw_reloading_numerical()
         else:
@@ -451,12 +624,56 @@ class GunGame(GameSystem):
         if draw_player:
             self.draw_pixel(self.player_x, self.player_y, 1)
         
-        for b in self.bullets:
-            self.draw_pixel(b['x'], b['y'], 1) # Draw bullets
+        bullet_active = self.bullet_active
+        draw = self.draw_pixel
+        for i in range(len(bullet_active)):
+            if bullet_active[i]:
+                draw(self.bullet_x[i], self.bullet_y[i], 1) # Draw bullets
         self.draw_targets() # Draw all active targets
-        
+
         self.show()
 
+    # === Main update ===
+    def update(self):
+        now = ticks_ms()
+
+        if self.game_state == "MENU":
+            self.update_menu()
+            return
+        if self.game_state == "GAME_OVER":
+            self.update_game_over()
+            return
+
+        if self._check_end_conditions():
+            return
+
+        self._handle_spawning(now)
+        self._handle_inputs()
+        self.update_targets(self.slowdown_q8)
+        self.update_bullets()
+        self.update_reload_status(self.slowdown_q8)
+
+        # Blink animations change the picture without any game state
+        # changing: reloading flashes the mag count and a low slowdown
+        # budget blinks the player, so flag those frames dirty too
+        if self.is_reloading:
+            self._frame_dirty = True
+        running_low = self.slowdown_budget < self.slowdown_warning_threshold
+        if running_low != self._was_running_low:
+            self._was_running_low = running_low
+            self._frame_dirty = True
+        if running_low:
+            phase = (now // 200) & 1
+            if phase != self._last_blink_phase:
+                self._last_blink_phase = phase
+                self._frame_dirty = True
+
+        # An unchanged image skips clear, every draw_* call and the SPI
+        # refresh entirely
+        if self._frame_dirty:
+            self._frame_dirty = False
+            self._render(now)
+
 # Run the game
 game = GunGame()
 game.run()
\ No newline at end of file
@@ -235,7 +235,9 @@ class TetrisGame:
     def check_for_lines(self):
         lines_to_clear = []
         for y in range(self.height):
-            if all(self.grid[y][x] == STATIC_COLOR for x in range(self.width)):
+            # Cells are only ever 0 or STATIC_COLOR, so a full row is
+            # simply one with no 0 left; list membership runs in C
+            if 0 not in self.grid[y]:
                 lines_to_clear.append(y)
         if lines_to_clear:
             self.score += len(lines_to_clear) ** 2
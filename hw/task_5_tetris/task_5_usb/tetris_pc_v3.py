@@ -1,8 +1,9 @@
 # pc_tetris_client.py
 # PC Client for Pico Tetris
-# Requires: pip install pygame pyserial
+# Requires: pip install pygame pyserial numpy
 
 import pygame
+import numpy as np
 import serial
 import socket
 import time
@@ -56,6 +57,32 @@ COLOR_MAP = {
     3: COLOR_STATIC
 }
 
+# Same mapping as a uint8 palette for the vectorized grid render;
+# the last entry is the fallback for unknown cell values
+PALETTE = np.array([COLOR_BG, COLOR_P1, COLOR_P2, COLOR_STATIC, COLOR_BLACK],
+                   dtype=np.uint8)
+
+# One cell plus its grid line, in pixels
+CELL_PX = BLOCK_SIZE + BORDER_SIZE
+
+# Movement keys are polled every frame (see poll_movement_keys) with a
+# software autorepeat; pause/menu keys stay edge-triggered events
+MOVEMENT_KEY_MAP = {
+    # Player 1
+    pygame.K_w: 'w',
+    pygame.K_a: 'a',
+    pygame.K_s: 's',
+    pygame.K_d: 'd',
+
+    # Player 2
+    pygame.K_UP:    'u',
+    pygame.K_LEFT:  'l',
+    pygame.K_DOWN:  'n',
+    pygame.K_RIGHT: 'r',
+}
+KEY_REPEAT_FIRST_MS = 150  # Delay before a held key starts repeating
+KEY_REPEAT_MS = 50         # Interval between repeats while held
+
 # ---------------------------------------------------------------
 # Tetromino Mini-Display
 # ---------------------------------------------------------------
@@ -228,6 +255,40 @@ class PygameClient:
         if self.error_message is None:
             self.comm_thread.start()
         
+        # Persistent surface the vectorized grid render blits into
+        self.grid_surface = pygame.Surface((GRID_WIDTH * CELL_PX, GRID_HEIGHT * CELL_PX))
+
+        # Pre-rendered one-cell tiles for the dirty-cell path, indexed
+        # by cell value like PALETTE; prev_cells is what grid_surface
+        # currently shows (None forces a full repaint)
+        self.cell_tiles = []
+        for color in PALETTE:
+            tile = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE))
+            tile.fill(tuple(int(c) for c in color))
+            self.cell_tiles.append(tile)
+        self.prev_cells = None
+
+        # Per-key autorepeat state for polled movement input
+        self.key_next_send = {}
+        self.key_held = set()
+
+        # Cached info panel; re-rendered only when its key changes
+        self.info_panel_surface = None
+        self.info_panel_key = None
+
+        # Overlays are static, so they are built once on first use
+        # instead of allocating and re-rendering a Surface every frame
+        self.game_over_overlay = None
+        self.pause_overlay = None
+        self.error_overlay = None
+        self.error_overlay_msg = None
+
+        # Dirty-rect bookkeeping: full flips happen on the first frame
+        # and while overlays are up, otherwise only changed rects are
+        # pushed to the display
+        self.need_full_flip = True
+        self.overlay_shown = False
+
         self.current_state = {
             "grid": [0] * (GRID_WIDTH * GRID_HEIGHT),
             "score": 0,
@@ -239,10 +300,20 @@ class PygameClient:
 
     def show_menu(self):
         """Displays a menu to select connection mode."""
+        # The menu is entirely static, so compose it into one Surface
+        # up front and push it to the display a single time; the loop
+        # below then only has to poll for input
+        menu = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        menu.fill(COLOR_BG)
         title_text = self.font_big.render("Pico Tetris", True, COLOR_WHITE)
         usb_text = self.font_medium.render("1: Play over USB", True, COLOR_WHITE)
         wifi_text = self.font_medium.render("2: Play over WiFi", True, COLOR_WHITE)
-        
+        menu.blit(title_text, (WINDOW_WIDTH // 2 - title_text.get_width() // 2, 100))
+        menu.blit(usb_text, (WINDOW_WIDTH // 2 - usb_text.get_width() // 2, 200))
+        menu.blit(wifi_text, (WINDOW_WIDTH // 2 - wifi_text.get_width() // 2, 250))
+        self.screen.blit(menu, (0, 0))
+        pygame.display.flip()
+
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -252,12 +323,6 @@ class PygameClient:
                         return "USB"
                     if event.key == pygame.K_2:
                         return "WIFI"
-
-            self.screen.fill(COLOR_BG)
-            self.screen.blit(title_text, (WINDOW_WIDTH // 2 - title_text.get_width() // 2, 100))
-            self.screen.blit(usb_text, (WINDOW_WIDTH // 2 - usb_text.get_width() // 2, 200))
-            self.screen.blit(wifi_text, (WINDOW_WIDTH // 2 - wifi_text.get_width() // 2, 250))
-            pygame.display.flip()
             self.clock.tick(15)
 
     def send_mode_to_pico(self, mode):
@@ -297,7 +362,9 @@ class PygameClient:
                     running = False
                 if event.type == pygame.KEYDOWN:
                     self.handle_keydown(event.key)
-            
+
+            self.poll_movement_keys()
+
             # 2. Get Game State from Pico
             try:
                 while not self.game_state_q.empty():
@@ -352,127 +419,209 @@ class PygameClient:
             self.input_q.put('p')
             return
 
-        # --- Player Game Input ---
-        key_map = {
-            # Player 1
-            pygame.K_w: 'w',
-            pygame.K_a: 'a',
-            pygame.K_s: 's',
-            pygame.K_d: 'd',
-            
-            # Player 2
-            pygame.K_UP:    'u',
-            pygame.K_LEFT:  'l',
-            pygame.K_DOWN:  'n',
-            pygame.K_RIGHT: 'r',
-        }
-        if key in key_map:
-            self.input_q.put(key_map[key])
+        # Movement keys are handled by poll_movement_keys
+
+    def poll_movement_keys(self):
+        """Poll held movement keys with software autorepeat.
+
+        Polling once per frame avoids event bursts from held keys and
+        sends at most one command per key per frame; the first repeat
+        waits longer than the rest, like a keyboard.
+        """
+        if self.current_state.get("paused", False):
+            return
+
+        now = pygame.time.get_ticks()
+        pressed = pygame.key.get_pressed()
+        for key, char in MOVEMENT_KEY_MAP.items():
+            if pressed[key]:
+                if now >= self.key_next_send.get(key, 0):
+                    self.input_q.put(char)
+                    delay = KEY_REPEAT_MS if key in self.key_held else KEY_REPEAT_FIRST_MS
+                    self.key_held.add(key)
+                    self.key_next_send[key] = now + delay
+            else:
+                self.key_held.discard(key)
+                self.key_next_send[key] = 0
 
     def draw(self):
         """Draw the entire game screen."""
-        self.screen.fill(COLOR_BG)
-        
-        self.draw_grid()
-        self.draw_info_panel()
-        
+        show_overlay = (self.current_state.get("paused", False)
+                        or self.current_state.get("game_over", False)
+                        or bool(self.error_message))
+        if self.overlay_shown and not show_overlay:
+            # An overlay just cleared; it covered the window fringe the
+            # grid and panel never repaint, so re-fill everything
+            self.need_full_flip = True
+
+        if self.need_full_flip:
+            # Paints the one-pixel window fringe the grid and panel
+            # surfaces never cover; they repaint their own areas
+            self.screen.fill(COLOR_BG)
+
+        dirty = self.draw_grid()
+        panel_rect = self.draw_info_panel()
+        if panel_rect:
+            dirty.append(panel_rect)
+
         # --- NEW: Handle Overlays ---
         if self.current_state.get("paused", False):
             self.draw_pause_menu()
         elif self.current_state.get("game_over", False):
             self.draw_game_over()
-            
+
         if self.error_message:
             self.draw_error()
 
-        pygame.display.flip()
+        # Overlay frames (and the frame after one clears) push the
+        # whole window; steady gameplay copies only the changed rects
+        if self.need_full_flip or show_overlay or self.overlay_shown:
+            pygame.display.flip()
+            self.need_full_flip = False
+        elif dirty:
+            pygame.display.update(dirty)
+        self.overlay_shown = show_overlay
 
     def draw_grid(self):
-        """Draw the 16x32 game grid."""
-        grid_data = self.current_state["grid"]
-        
-        for i in range(len(grid_data)):
-            x = i % GRID_WIDTH
-            y = i // GRID_WIDTH
-            
-            color = COLOR_MAP.get(grid_data[i], COLOR_BLACK)
-            
-            # Calculate position
-            draw_x = (BLOCK_SIZE + BORDER_SIZE) * x + BORDER_SIZE
-            draw_y = (BLOCK_SIZE + BORDER_SIZE) * y + BORDER_SIZE
-            
-            pygame.draw.rect(self.screen, color, 
-                             (draw_x, draw_y, BLOCK_SIZE, BLOCK_SIZE))
+        """Draw the 16x32 game grid, repainting only changed cells.
+
+        Returns the changed areas as screen-space rects for the
+        dirty-rect display update.
+        """
+        cells = np.asarray(self.current_state["grid"], dtype=np.uint8)
+        cells = np.minimum(cells, len(PALETTE) - 1).reshape(GRID_HEIGHT, GRID_WIDTH)
+
+        rects = []
+        if self.prev_cells is None:
+            self.render_full_grid(cells)
+            rects.append(pygame.Rect(BORDER_SIZE, BORDER_SIZE,
+                                     GRID_WIDTH * CELL_PX, GRID_HEIGHT * CELL_PX))
+        else:
+            # In a steady frame only the two falling pieces moved
+            # (16 cells at most), so blit pre-rendered tiles at the
+            # diff positions instead of repainting all 512 cells
+            blit = self.grid_surface.blit
+            tiles = self.cell_tiles
+            for y, x in zip(*np.nonzero(cells != self.prev_cells)):
+                blit(tiles[cells[y, x]], (x * CELL_PX, y * CELL_PX))
+                rects.append(pygame.Rect(BORDER_SIZE + x * CELL_PX,
+                                         BORDER_SIZE + y * CELL_PX,
+                                         CELL_PX, CELL_PX))
+
+        self.prev_cells = cells
+        self.screen.blit(self.grid_surface, (BORDER_SIZE, BORDER_SIZE))
+        return rects
+
+    def render_full_grid(self, cells):
+        """Vectorized full repaint of the grid surface."""
+        # Palette lookup + pixel upscale in NumPy replaces the old
+        # 512 pygame.draw.rect calls (one Python-to-C round trip each)
+        # with a handful of whole-array operations
+        big = np.repeat(np.repeat(PALETTE[cells], CELL_PX, axis=0), CELL_PX, axis=1)
+
+        # The last pixel row/column of every upscaled cell is a grid line
+        big[CELL_PX - 1::CELL_PX, :] = COLOR_BG
+        big[:, CELL_PX - 1::CELL_PX] = COLOR_BG
+
+        # surfarray expects (width, height, 3)
+        pygame.surfarray.blit_array(self.grid_surface, big.swapaxes(0, 1))
                              
     def draw_info_panel(self):
-        """Draw the side panel with score and next pieces."""
-        panel_x = GAME_AREA_WIDTH
-        
-        # --- Score ---
-        score_text = self.font_big.render("SCORE", True, COLOR_WHITE)
-        score_val = self.font_big.render(str(self.current_state["score"]), True, COLOR_WHITE)
-        
-        self.screen.blit(score_text, (panel_x + (INFO_PANEL_WIDTH - score_text.get_width()) // 2, 50))
-        self.screen.blit(score_val, (panel_x + (INFO_PANEL_WIDTH - score_val.get_width()) // 2, 100))
-
-        # --- Player 1 Next ---
-        p1_text = self.font_medium.render("P1 Next", True, COLOR_P1)
-        self.screen.blit(p1_text, (panel_x + (INFO_PANEL_WIDTH - p1_text.get_width()) // 2, 200))
-        draw_mini_shape(self.screen, self.current_state.get("p1_next", ""), 
-                        panel_x + (INFO_PANEL_WIDTH // 2) - (2 * 11), 240) # Center shape
-
-        # --- Player 2 Next ---
-        p2_text = self.font_medium.render("P2 Next", True, COLOR_P2)
-        self.screen.blit(p2_text, (panel_x + (INFO_PANEL_WIDTH - p2_text.get_width()) // 2, 350))
-        draw_mini_shape(self.screen, self.current_state.get("p2_next", ""), 
-                        panel_x + (INFO_PANEL_WIDTH // 2) - (2 * 11), 390) # Center shape
+        """Draw the side panel with score and next pieces.
+
+        Returns the panel rect when it was re-rendered, else None.
+        """
+        state = self.current_state
+        key = (state["score"], state.get("p1_next", ""), state.get("p2_next", ""))
+        rerendered = key != self.info_panel_key
+
+        # Glyph rasterization is expensive and the panel only changes
+        # when the score or a next piece does, so for typical play the
+        # cached surface is reused for hundreds of frames
+        if key != self.info_panel_key:
+            panel = pygame.Surface((INFO_PANEL_WIDTH, WINDOW_HEIGHT))
+            panel.fill(COLOR_BG)
+
+            # --- Score ---
+            score_text = self.font_big.render("SCORE", True, COLOR_WHITE)
+            score_val = self.font_big.render(str(key[0]), True, COLOR_WHITE)
+            panel.blit(score_text, ((INFO_PANEL_WIDTH - score_text.get_width()) // 2, 50))
+            panel.blit(score_val, ((INFO_PANEL_WIDTH - score_val.get_width()) // 2, 100))
+
+            # --- Player 1 Next ---
+            p1_text = self.font_medium.render("P1 Next", True, COLOR_P1)
+            panel.blit(p1_text, ((INFO_PANEL_WIDTH - p1_text.get_width()) // 2, 200))
+            draw_mini_shape(panel, key[1],
+                            (INFO_PANEL_WIDTH // 2) - (2 * 11), 240) # Center shape
+
+            # --- Player 2 Next ---
+            p2_text = self.font_medium.render("P2 Next", True, COLOR_P2)
+            panel.blit(p2_text, ((INFO_PANEL_WIDTH - p2_text.get_width()) // 2, 350))
+            draw_mini_shape(panel, key[2],
+                            (INFO_PANEL_WIDTH // 2) - (2 * 11), 390) # Center shape
+
+            self.info_panel_surface = panel
+            self.info_panel_key = key
+
+        self.screen.blit(self.info_panel_surface, (GAME_AREA_WIDTH, 0))
+        if rerendered:
+            return pygame.Rect(GAME_AREA_WIDTH, 0, INFO_PANEL_WIDTH, WINDOW_HEIGHT)
+        return None
 
     def draw_game_over(self):
         """Display a 'Game Over' overlay."""
-        overlay = pygame.Surface((GAME_AREA_WIDTH, 200), pygame.SRCALPHA)
-        overlay.fill((50, 50, 50, 200)) # Semi-transparent grey
-        
-        text1 = self.font_big.render("GAME OVER", True, COLOR_WHITE)
-        text2 = self.font_medium.render("Pico will restart game", True, COLOR_WHITE)
-        
-        overlay.blit(text1, ( (GAME_AREA_WIDTH - text1.get_width()) // 2, 50) )
-        overlay.blit(text2, ( (GAME_AREA_WIDTH - text2.get_width()) // 2, 120) )
-        
-        self.screen.blit(overlay, (0, (GAME_AREA_HEIGHT - 200) // 2))
+        if self.game_over_overlay is None:
+            overlay = pygame.Surface((GAME_AREA_WIDTH, 200), pygame.SRCALPHA)
+            overlay.fill((50, 50, 50, 200)) # Semi-transparent grey
+
+            text1 = self.font_big.render("GAME OVER", True, COLOR_WHITE)
+            text2 = self.font_medium.render("Pico will restart game", True, COLOR_WHITE)
+
+            overlay.blit(text1, ( (GAME_AREA_WIDTH - text1.get_width()) // 2, 50) )
+            overlay.blit(text2, ( (GAME_AREA_WIDTH - text2.get_width()) // 2, 120) )
+            self.game_over_overlay = overlay
+
+        self.screen.blit(self.game_over_overlay, (0, (GAME_AREA_HEIGHT - 200) // 2))
 
     def draw_pause_menu(self):
         """Display the interactive pause menu."""
-        overlay = pygame.Surface((GAME_AREA_WIDTH, 300), pygame.SRCALPHA)
-        overlay.fill((50, 50, 50, 220)) # Semi-transparent grey
-        
-        text1 = self.font_big.render("PAUSED", True, COLOR_WHITE)
-        text2 = self.font_medium.render("1: Resume (or P)", True, COLOR_WHITE)
-        text3 = self.font_medium.render("2: Restart", True, COLOR_WHITE)
-        text4 = self.font_medium.render("3: Main Menu", True, COLOR_WHITE)
-        
-        overlay.blit(text1, ( (GAME_AREA_WIDTH - text1.get_width()) // 2, 50) )
-        overlay.blit(text2, ( (GAME_AREA_WIDTH - text2.get_width()) // 2, 120) )
-        overlay.blit(text3, ( (GAME_AREA_WIDTH - text3.get_width()) // 2, 160) )
-        overlay.blit(text4, ( (GAME_AREA_WIDTH - text4.get_width()) // 2, 200) )
-        
-        self.screen.blit(overlay, (0, (GAME_AREA_HEIGHT - 300) // 2))
+        if self.pause_overlay is None:
+            overlay = pygame.Surface((GAME_AREA_WIDTH, 300), pygame.SRCALPHA)
+            overlay.fill((50, 50, 50, 220)) # Semi-transparent grey
+
+            text1 = self.font_big.render("PAUSED", True, COLOR_WHITE)
+            text2 = self.font_medium.render("1: Resume (or P)", True, COLOR_WHITE)
+            text3 = self.font_medium.render("2: Restart", True, COLOR_WHITE)
+            text4 = self.font_medium.render("3: Main Menu", True, COLOR_WHITE)
+
+            overlay.blit(text1, ( (GAME_AREA_WIDTH - text1.get_width()) // 2, 50) )
+            overlay.blit(text2, ( (GAME_AREA_WIDTH - text2.get_width()) // 2, 120) )
+            overlay.blit(text3, ( (GAME_AREA_WIDTH - text3.get_width()) // 2, 160) )
+            overlay.blit(text4, ( (GAME_AREA_WIDTH - text4.get_width()) // 2, 200) )
+            self.pause_overlay = overlay
+
+        self.screen.blit(self.pause_overlay, (0, (GAME_AREA_HEIGHT - 300) // 2))
 
     def draw_error(self):
         """Display an error message."""
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((100, 0, 0, 220)) # Semi-transparent red
-        
-        text1 = self.font_big.render("ERROR", True, COLOR_WHITE)
-        text2 = self.font_medium.render(self.error_message, True, COLOR_WHITE)
-        text3 = self.font_small.render("Check Pico connection andSERIAL_PORT.", True, COLOR_WHITE)
-        text4 = self.font_small.render("Restart both Pico and PC client.", True, COLOR_WHITE)
-        
-        overlay.blit(text1, ( (WINDOW_WIDTH - text1.get_width()) // 2, 100) )
-        overlay.blit(text2, ( (WINDOW_WIDTH - text2.get_width()) // 2, 200) )
-        overlay.blit(text3, ( (WINDOW_WIDTH - text3.get_width()) // 2, 250) )
-        overlay.blit(text4, ( (WINDOW_WIDTH - text4.get_width()) // 2, 280) )
-        
-        self.screen.blit(overlay, (0, 0))
+        # Cached per message text (the message can change)
+        if self.error_overlay is None or self.error_overlay_msg != self.error_message:
+            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
+            overlay.fill((100, 0, 0, 220)) # Semi-transparent red
+
+            text1 = self.font_big.render("ERROR", True, COLOR_WHITE)
+            text2 = self.font_medium.render(self.error_message, True, COLOR_WHITE)
+            text3 = self.font_small.render("Check Pico connection andSERIAL_PORT.", True, COLOR_WHITE)
+            text4 = self.font_small.render("Restart both Pico and PC client.", True, COLOR_WHITE)
+
+            overlay.blit(text1, ( (WINDOW_WIDTH - text1.get_width()) // 2, 100) )
+            overlay.blit(text2, ( (WINDOW_WIDTH - text2.get_width()) // 2, 200) )
+            overlay.blit(text3, ( (WINDOW_WIDTH - text3.get_width()) // 2, 250) )
+            overlay.blit(text4, ( (WINDOW_WIDTH - text4.get_width()) // 2, 280) )
+            self.error_overlay = overlay
+            self.error_overlay_msg = self.error_message
+
+        self.screen.blit(self.error_overlay, (0, 0))
 
 # ---------------------------------------------------------------
 # Entry Point
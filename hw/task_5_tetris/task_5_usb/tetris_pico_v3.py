@@ -3,6 +3,7 @@
 # Runs the Tetris game logic and acts as a server for the PC client.
 
 import machine
+import micropython
 import time
 import sys
 import select
@@ -42,6 +43,16 @@ PLAYER_1_COLOR = 1  # 1 represents Player 1's piece
 PLAYER_2_COLOR = 2  # 2 represents Player 2's piece
 STATIC_COLOR = 3  # Represents a placed piece
 
+# Bitboard constants: each grid row is one int with bit x set when
+# column x holds a locked piece, so a full line is a single == test
+# and collision is a bit probe
+FULL_ROW_MASK = (1 << DISPLAY_WIDTH) - 1
+
+# Bit-reversal table: grid rows keep column 0 in the LSB, while each
+# MAX7219 module byte wants its leftmost column in the MSB
+REV8 = bytes(sum(((i >> b) & 1) << (7 - b) for b in range(8))
+             for i in range(256))
+
 # Tetromino shapes (O, I, S, Z, L, J, T)
 TETROMINOES = {
     'O': [(0, 0), (1, 0), (0, 1), (1, 1)],
@@ -54,6 +65,21 @@ TETROMINOES = {
 }
 TETROMINO_KEYS = list(TETROMINOES.keys())
 
+def _rotate_shape(shape_key, shape):
+    """One 90-degree rotation step, same pivot rule rotate() used."""
+    pivot = (1, 1) if shape_key == 'I' else shape[1]
+    return tuple((-(py - pivot[1]) + pivot[0], (px - pivot[0]) + pivot[1])
+                 for (px, py) in shape)
+
+# All four rotation states per tetromino, computed once at import so a
+# rotate keypress is a table lookup instead of rebuilding the shape
+ROTATIONS = {}
+for _key, _shape in TETROMINOES.items():
+    _states = [tuple(_shape)]
+    for _ in range(3):
+        _states.append(_rotate_shape(_key, _states[-1]))
+    ROTATIONS[_key] = _states
+
 # ---------------------------------------------------------------
 # Minimal MAX7219 Driver
 # ---------------------------------------------------------------
@@ -165,13 +191,21 @@ class TetrisGame:
     def __init__(self):
         self.width = DISPLAY_WIDTH
         self.height = DISPLAY_HEIGHT
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        # Bitboard playfield: one int bitmask per row (see
+        # FULL_ROW_MASK). Only locked cells live here; active pieces
+        # are overlaid where needed.
+        self.rows = [0] * self.height
         self.score = 0
         self.game_over = False
         
         self.p1 = self.Player(self, PLAYER_1_COLOR, self.width // 2 - 4)
         self.p2 = self.Player(self, PLAYER_2_COLOR, self.width // 2 + 1)
-        
+
+        # Each player keeps a direct reference to its opponent so the
+        # collision check doesn't re-derive it from the color each call
+        self.p1.other = self.p2
+        self.p2.other = self.p1
+
         self.p1.next_shape = self.get_random_shape()
         self.p2.next_shape = self.get_random_shape()
         
@@ -198,36 +232,55 @@ class TetrisGame:
             self.start_x = start_x
             self.shape = None
             self.shape_key = ''
+            self.rot = 0
             self.x = 0
             self.y = 0
             self.next_shape = ''
             self.is_placed = False
+            self.other = None  # set by TetrisGame once both players exist
 
         def spawn(self, shape_key):
             self.shape_key = shape_key
-            self.shape = TETROMINOES[shape_key]
+            self.rot = 0
+            self.shape = ROTATIONS[shape_key][0]
             self.x = self.start_x
             self.y = 0 # Spawn at top
             self.is_placed = False
 
+        # Hottest routine in the game (every move, rotate and gravity
+        # step); the native emitter compiles it to machine code
+        @micropython.native
         def is_valid_position(self, shape=None, x=None, y=None):
             shape = shape if shape is not None else self.shape
             x = x if x is not None else self.x
             y = y if y is not None else self.y
-            
+
+            # Hoisted out of the cell loop: none of this changes
+            # mid-check, and the old code recomputed the opponent
+            # reference for every cell
+            game = self.game
+            rows = game.rows
+            width = game.width
+            height = game.height
+            other = self.other
+            check_other = not other.is_placed
+            other_shape = other.shape
+            ox = other.x
+            oy = other.y
+
             for (px, py) in shape:
-                nx, ny = x + px, y + py
+                nx = x + px
+                ny = y + py
                 # Check bounds
-                if not (0 <= nx < self.game.width and 0 <= ny < self.game.height):
+                if not (0 <= nx < width and 0 <= ny < height):
                     return False
-                # Check for collision with static pieces
-                if self.game.grid[ny][nx] == STATIC_COLOR:
+                # Check for collision with static pieces (bit probe)
+                if (rows[ny] >> nx) & 1:
                     return False
                 # Check for collision with *other* player's active piece
-                other_player = self.game.p2 if self.color == PLAYER_1_COLOR else self.game.p1
-                if not other_player.is_placed:
-                    for (opx, opy) in other_player.shape:
-                        if (other_player.x + opx == nx and other_player.y + opy == ny):
+                if check_other:
+                    for (opx, opy) in other_shape:
+                        if ox + opx == nx and oy + opy == ny:
                             return False
             return True
 
@@ -243,34 +296,19 @@ class TetrisGame:
         def rotate(self):
             if self.is_placed or self.shape_key == 'O':
                 return
-            
-            # Simple rotation logic
-            pivot = self.shape[1] 
-            
-            new_shape = []
-            if self.shape_key == 'I':
-                pivot = (1, 1) # Use a conceptual pivot
-                for (px, py) in self.shape:
-                    new_shape.append((-(py - pivot[1]) + pivot[0], (px - pivot[0]) + pivot[1]))
-            else:
-                 for (px, py) in self.shape:
-                    new_shape.append((-(py - pivot[1]) + pivot[0], (px - pivot[0]) + pivot[1]))
-            
-            # "Wall kick"
-            if self.is_valid_position(shape=new_shape):
-                self.shape = new_shape
-            elif self.is_valid_position(shape=new_shape, x=self.x + 1):
-                self.shape = new_shape
-                self.x += 1
-            elif self.is_valid_position(shape=new_shape, x=self.x - 1):
-                self.shape = new_shape
-                self.x -= 1
-            elif self.is_valid_position(shape=new_shape, x=self.x + 2):
-                self.shape = new_shape
-                self.x += 2
-            elif self.is_valid_position(shape=new_shape, x=self.x - 2):
-                self.shape = new_shape
-                self.x -= 2
+
+            # Next state comes from the precomputed table; &3 wraps the
+            # rotation index (4 states, power of two)
+            new_rot = (self.rot + 1) & 3
+            new_shape = ROTATIONS[self.shape_key][new_rot]
+
+            # "Wall kick": try in place, then shifted 1 and 2 columns
+            for kick in (0, 1, -1, 2, -2):
+                if self.is_valid_position(shape=new_shape, x=self.x + kick):
+                    self.shape = new_shape
+                    self.rot = new_rot
+                    self.x += kick
+                    return
 
 
     def step_gravity(self):
@@ -307,16 +345,17 @@ class TetrisGame:
         if player.is_placed:
             return
         player.is_placed = True
+        rows = self.rows
         for (px, py) in player.shape:
             nx, ny = player.x + px, player.y + py
             if 0 <= ny < self.height and 0 <= nx < self.width:
-                self.grid[ny][nx] = STATIC_COLOR
+                rows[ny] |= 1 << nx
 
     def check_for_lines(self):
         """Check for and clear completed lines."""
         lines_to_clear = []
         for y in range(self.height):
-            if all(self.grid[y][x] == STATIC_COLOR for x in range(self.width)):
+            if self.rows[y] == FULL_ROW_MASK:
                 lines_to_clear.append(y)
         
         if lines_to_clear:
@@ -329,12 +368,13 @@ class TetrisGame:
         
     def finish_line_clear(self, cleared_lines):
         """Called after flicker, to remove lines and shift grid down."""
-        for y_to_clear in cleared_lines:
-            # Remove the cleared line
-            del self.grid[y_to_clear]
-            # Add a new empty line at the top
-            self.grid.insert(0, [0 for _ in range(self.width)])
-            
+        # Rebuild in one pass: surviving rows keep their order and drop
+        # down, fresh empty rows fill the top. Avoids a del+insert pair
+        # (each an O(height) list shuffle) per cleared line.
+        cleared = set(cleared_lines)
+        survivors = [row for y, row in enumerate(self.rows) if y not in cleared]
+        self.rows = [0] * len(cleared) + survivors
+
         # After clearing, spawn new pieces
         self.spawn_new_pieces()
 
@@ -362,25 +402,21 @@ class TetrisGame:
             
     def get_game_state(self, is_paused=False):
         """Generate the full game state for the client."""
-        # Create a temporary grid with active pieces drawn on it
-        temp_grid = [row[:] for row in self.grid]
-        
-        # Draw P1
-        if not self.p1.is_placed:
-            for (px, py) in self.p1.shape:
-                nx, ny = self.p1.x + px, self.p1.y + py
-                if 0 <= ny < self.height and 0 <= nx < self.width:
-                    temp_grid[ny][nx] = self.p1.color
-
-        # Draw P2
-        if not self.p2.is_placed:
-            for (px, py) in self.p2.shape:
-                nx, ny = self.p2.x + px, self.p2.y + py
-                if 0 <= ny < self.height and 0 <= nx < self.width:
-                    temp_grid[ny][nx] = self.p2.color
-        
-        # Flatten grid
-        flat_grid = [cell for row in temp_grid for cell in row]
+        # Expand the row bitmasks straight into the flat cell list
+        width = self.width
+        flat_grid = []
+        for r in self.rows:
+            for x in range(width):
+                flat_grid.append(STATIC_COLOR if (r >> x) & 1 else 0)
+
+        # Overlay the active pieces
+        for player in (self.p1, self.p2):
+            if player.is_placed:
+                continue
+            for (px, py) in player.shape:
+                nx, ny = player.x + px, player.y + py
+                if 0 <= ny < self.height and 0 <= nx < width:
+                    flat_grid[ny * width + nx] = player.color
         
         state = {
             "grid": flat_grid,
@@ -400,42 +436,45 @@ class TetrisGame:
 # Display Drawing Function
 # ---------------------------------------------------------------
 
-def draw_game_to_display(display, game_state_json):
+def draw_game_to_display(display, game):
     """Draws the game state onto the MAX7219 display."""
     try:
-        state = ujson.loads(game_state_json)
-        grid_flat = state["grid"]
-        
-        display.clear()
-        
-        for i in range(len(grid_flat)):
-            x = i % DISPLAY_WIDTH
-            y = i // DISPLAY_WIDTH
-            
-            # Draw any piece (active or static)
-            if grid_flat[i] != 0:
-                display.set_pixel(x, y, 1)
-                
+        # Each grid row is already a bitmask, so the two module bytes
+        # covering it are just bit-reversed byte halves of the row
+        rows = game.rows
+        buffer = display.buffer
+        for y in range(DISPLAY_HEIGHT):
+            r = rows[y]
+            # Module layout is 2 wide: matrix_index = (y // 8) * 2,
+            # byte = matrix_index * 8 + (y % 8), right module is +8
+            base = (y >> 3) * 16 + (y & 7)
+            buffer[base] = REV8[r & 0xFF]
+            buffer[base + 8] = REV8[(r >> 8) & 0xFF]
+
+        # Overlay the falling pieces: at most 8 cells
+        for player in (game.p1, game.p2):
+            if player.is_placed:
+                continue
+            for (px, py) in player.shape:
+                display.set_pixel(player.x + px, player.y + py, 1)
+
         display.show()
     except Exception as e:
         print("Error drawing to display:", e)
 
 def display_line_flicker(display, game, lines_to_clear):
     """Flicker the cleared lines."""
-    for _ in range(3): # Flicker 3 times
-        # Turn lines off
-        for y in lines_to_clear:
-            for x in range(DISPLAY_WIDTH):
-                display.set_pixel(x, y, 0)
-        display.show()
-        time.sleep(0.1)
-        
-        # Turn lines on
-        for y in lines_to_clear:
-            for x in range(DISPLAY_WIDTH):
-                display.set_pixel(x, y, 1)
-        display.show()
-        time.sleep(0.1)
+    # A cleared row is always full, so toggle the two module bytes
+    # covering it directly instead of 16 set_pixel calls per row
+    buffer = display.buffer
+    offsets = [(y >> 3) * 16 + (y & 7) for y in lines_to_clear]
+    for _ in range(3): # Flicker 3 times: off then on
+        for fill in (0x00, 0xFF):
+            for base in offsets:
+                buffer[base] = fill
+                buffer[base + 8] = fill
+            display.show()
+            time.sleep(0.1)
 
 # ---------------------------------------------------------------
 # Communication Handlers
@@ -711,7 +750,7 @@ def game_loop(mode, display):
         if is_paused:
             display.display_text("PAUSE")
         elif not flicker_info:
-            draw_game_to_display(display, game_state_json)
+            draw_game_to_display(display, game)
 
         # --- 6. Print to REPL (REMOVED) ---
         
@@ -1,7 +1,8 @@
 import network
 import time
-import json
+import struct
 import machine
+import micropython
 from simple import MQTTClient
 from machine import Pin, I2C
 import ssd1306
@@ -23,16 +24,32 @@ MQTT_SERVER = "10.42.0.1"
 
 MQTT_CLIENT_ID = f"pico_display_{MY_ID}"
 
-TOPIC_HEARTBEAT = "pico/heartbeat"
-TOPIC_BALL_POS = "pico/ball_pos"
+TOPIC_HEARTBEAT = b"pico/heartbeat"
+TOPIC_BALL_POS = b"pico/ball_pos"
+
+# Binary wire format for the ball state: pos_x, pos_y (unsigned),
+# vel_x, vel_y (signed), total_h, total_w, order length, followed by
+# the order ids as raw bytes. struct-packed instead of JSON so each
+# tick costs a few fixed-size byte copies, not dict/string churn.
+BALL_FMT = "<BBbbBBB"
+BALL_HEAD = struct.calcsize(BALL_FMT)
+
+# Heartbeats carry just the sender id
+HEARTBEAT_MSG = bytes([MY_ID])
 
 # Screen config (logical game grid)
 SCREEN_HEIGHT = 16
 SCREEN_WIDTH = 8
 
-HEARTBEAT_INTERVAL_S = 1
-PICO_TIMEOUT_S = 3.5
-GAME_TICK_S = 0.1
+# Scheduling intervals as integer milliseconds: ticks_ms/ticks_diff
+# compares are plain int ops (the Pico has no FPU) and the tick
+# counter is monotonic, unlike time.time()
+HEARTBEAT_INTERVAL_MS = 1000
+PICO_TIMEOUT_MS = 3500
+GAME_TICK_MS = 100
+# How long each loop pass blocks waiting for an MQTT message
+# (settimeout takes seconds)
+MQTT_WAIT_S = GAME_TICK_MS / 2000
 
 # ============================================================
 # 2. HARDWARE: OLED SETUP
@@ -82,7 +99,10 @@ led = machine.Pin("LED", machine.Pin.OUT)
 
 active_picos = {}
 i_am_main = False
-last_drawn_state = {}
+# Signature of the last frame drawn: (pos, order, main flag). Tuples
+# compare cheaply and cannot alias the live state the way the old
+# shallow dict copy did.
+last_drawn_sig = None
 
 current_ball_state = {
     "pos": [0, 0],
@@ -110,14 +130,18 @@ def connect_wifi():
 def mqtt_callback(topic, msg):
     global current_ball_state
 
-    topic = topic.decode()
-    data = json.loads(msg.decode())
-
+    # topic arrives as bytes; comparing directly avoids a decode
     if topic == TOPIC_HEARTBEAT:
-        active_picos[data["id"]] = time.time()
+        active_picos[msg[0]] = time.ticks_ms()
 
     elif topic == TOPIC_BALL_POS:
-        current_ball_state = data
+        px, py, vx, vy, th, tw, n = struct.unpack_from(BALL_FMT, msg)
+        current_ball_state = {
+            "pos": [px, py],
+            "vel": [vx, vy],
+            "total_size": [th, tw],
+            "order": list(msg[BALL_HEAD:BALL_HEAD + n]),
+        }
 
 
 def connect_mqtt():
@@ -133,9 +157,11 @@ def connect_mqtt():
 # 5. GAME PHYSICS (MAIN PICO)
 # ============================================================
 
+# Integer move/bounce math on the hot tick path; the native emitter
+# compiles it to machine code (viper's typed ints do not fit here
+# because the function also touches lists and the MQTT client)
+@micropython.native
 def main_physics_loop():
-    global current_ball_state
-
     active_ids = sorted(active_picos.keys())
     if not active_ids:
         return
@@ -143,8 +169,11 @@ def main_physics_loop():
     total_width = len(active_ids) * SCREEN_WIDTH
     total_height = SCREEN_HEIGHT
 
-    pos = current_ball_state["pos"]
-    vel = current_ball_state["vel"]
+    # Mutate the shared state in place: rebuilding the dict and its
+    # lists every 100 ms tick churned the heap and triggered GC pauses
+    state = current_ball_state
+    pos = state["pos"]
+    vel = state["vel"]
 
     # Move ball
     pos[0] = (pos[0] + vel[0]) % total_width
@@ -159,27 +188,27 @@ def main_physics_loop():
         pos[1] = total_height - 1
         vel[1] = -vel[1]
 
-    new_state = {
-        "total_size": [total_height, total_width],
-        "pos": pos,
-        "vel": vel,
-        "order": active_ids
-    }
+    size = state["total_size"]
+    size[0] = total_height
+    size[1] = total_width
+    state["order"] = active_ids
 
-    mqtt_client.publish(TOPIC_BALL_POS, json.dumps(new_state))
-    current_ball_state = new_state
+    payload = struct.pack(BALL_FMT, pos[0], pos[1], vel[0], vel[1],
+                          total_height, total_width,
+                          len(active_ids)) + bytes(active_ids)
+    mqtt_client.publish(TOPIC_BALL_POS, payload)
 
 # ============================================================
 # 6. HEARTBEAT + PRUNE
 # ============================================================
 
 def publish_heartbeat():
-    mqtt_client.publish(TOPIC_HEARTBEAT, json.dumps({"id": MY_ID}))
+    mqtt_client.publish(TOPIC_HEARTBEAT, HEARTBEAT_MSG)
 
 def prune_picos():
-    now = time.time()
+    now = time.ticks_ms()
     for pid in list(active_picos.keys()):
-        if now - active_picos[pid] > PICO_TIMEOUT_S:
+        if time.ticks_diff(now, active_picos[pid]) > PICO_TIMEOUT_MS:
             del active_picos[pid]
 
 # ============================================================
@@ -199,19 +228,28 @@ def update_display(ball_state):
 # ============================================================
 
 def run():
-    global i_am_main, last_drawn_state
+    global i_am_main, last_drawn_sig
 
     connect_wifi()
     connect_mqtt()
 
-    last_hb = time.time()
-    last_tick = time.time()
+    last_hb = time.ticks_ms()
+    last_tick = time.ticks_ms()
 
     while True:
-        mqtt_client.check_msg()
-        now = time.time()
-
-        if now - last_hb > HEARTBEAT_INTERVAL_S:
+        # Block on the socket for up to half a game tick instead of
+        # polling check_msg and sleeping: messages are handled the
+        # moment they arrive and idle passes cost no wakeups.
+        # wait_msg() flips the socket back to fully blocking after its
+        # first byte, so the timeout must be re-armed every pass.
+        mqtt_client.sock.settimeout(MQTT_WAIT_S)
+        try:
+            mqtt_client.wait_msg()
+        except OSError:
+            pass  # Timeout: nothing arrived this interval
+        now = time.ticks_ms()
+
+        if time.ticks_diff(now, last_hb) > HEARTBEAT_INTERVAL_MS:
             publish_heartbeat()
             last_hb = now
 
@@ -222,15 +260,16 @@ def run():
             i_am_main = (MY_ID == active_ids[0])
 
             if i_am_main:
-                if now - last_tick > GAME_TICK_S:
+                if time.ticks_diff(now, last_tick) > GAME_TICK_MS:
                     main_physics_loop()
                     last_tick = now
 
-        if current_ball_state != last_drawn_state:
+        sig = (tuple(current_ball_state["pos"]),
+               tuple(current_ball_state["order"]),
+               i_am_main)
+        if sig != last_drawn_sig:
             update_display(current_ball_state)
-            last_drawn_state = current_ball_state.copy()
-
-        time.sleep(0.01)
+            last_drawn_sig = sig
 
 # ============================================================
 # 9. START
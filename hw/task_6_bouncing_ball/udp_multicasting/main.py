@@ -148,23 +148,28 @@ def check_sockets():
 
 # --- 4. LOGIC & DISPLAY FUNCTIONS ---
 
+# Reusable screen template: 16 rows of dots, newline-terminated, with
+# a fixed stride so a cell is one byte write. Rebuilding this as a
+# list-of-lists per frame allocated ~144 objects and caused GC spikes.
+_ROW_STRIDE = SCREEN_WIDTH + 1
+_BLANK_SCREEN = bytes(b'.' * SCREEN_WIDTH + b'\n') * SCREEN_HEIGHT
+_SCREEN_BUF = bytearray(_BLANK_SCREEN)
+
 def print_terminal_display(ball_state, is_on_my_screen, local_x, global_y):
     """Prints a 16x8 text representation of the screen to the terminal."""
-    buf = [['.' for _ in range(SCREEN_WIDTH)] for _ in range(SCREEN_HEIGHT)]
-    
+    _SCREEN_BUF[:] = _BLANK_SCREEN
+
     if is_on_my_screen:
         local_x = max(0, min(local_x, SCREEN_WIDTH - 1))
         global_y = max(0, min(global_y, SCREEN_HEIGHT - 1))
-        buf[global_y][local_x] = 'O'
-    
-    print(f"\n--- PICO {MY_ID} (Role: {'Main' if i_am_main else 'Follower'}) ---")
-    for row in buf:
-        print("".join(row))
-        
+        _SCREEN_BUF[global_y * _ROW_STRIDE + local_x] = ord('O')
+
     order = ball_state.get("order", [])
     pos = ball_state.get("pos", [])
-    print(f"Pos: {pos} Order: {order}")
-    print("--------------------------------")
+    # One print for the whole frame instead of one write per row
+    print(f"\n--- PICO {MY_ID} (Role: {'Main' if i_am_main else 'Follower'}) ---\n"
+          + _SCREEN_BUF.decode()
+          + f"Pos: {pos} Order: {order}\n--------------------------------")
 
 def update_display(ball_state):
     """Calculates positions and prints to terminal."""